@@ -39,14 +39,125 @@ if os.path.isdir(ca_path) and 'cacert.pem' in os.listdir(ca_path):
     os.environ['REQUESTS_CA_BUNDLE'] = os.path.join(ca_path, 'cacert.pem')
 
 import threading  # NOQA
-import requests  # NOQA
-import json  # NOQA
+import logging  # NOQA
+import traceback  # NOQA
+import time  # NOQA
+import math  # NOQA
 import fnmatch  # NOQA
+import re  # NOQA
+import unicodedata  # NOQA
+
+try:
+    import orjson as _json  # NOQA
+except ImportError:
+    import json as _json  # NOQA
+
+try:
+    import ijson  # NOQA
+except ImportError:
+    ijson = None
+
+try:
+    import queue  # NOQA
+except ImportError:
+    import Queue as queue  # NOQA
 
 from uuid import uuid4 as new_guid  # NOQA
 
 
 _SERVER = 'https://home.sensibo.com/api/v2'
+_TIMEOUT = (3.05, 10)
+# every poll worker can have a request in flight to the one host, the
+# connection pool is sized to match so no connection gets thrown away
+_POLL_WORKERS = 16
+_POLL_BACKOFF = 1.5
+# a device that can not be reached is backed off up to this many seconds,
+# or its max poll interval if that is longer, even when it is not idling
+_POLL_RETRY_MAX = 60.0
+
+_LOGGER = logging.getLogger(__name__)
+
+try:
+    _monotonic = time.monotonic
+except AttributeError:
+    _monotonic = time.time
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+# requests.HTTPError, resolved by _new_session. a Pod can not be made
+# without a session so it is always set before a Pod makes a request
+_HTTPError = None
+
+
+def _new_session(api_key):
+    # requests takes a while to import, it is not loaded until the first
+    # session is made so importing this module stays quick
+    global _HTTPError
+
+    import requests  # NOQA
+    from requests.adapters import HTTPAdapter  # NOQA
+
+    try:
+        # older requests releases only ship a vendored urllib3
+        from requests.packages.urllib3.util.retry import Retry  # NOQA
+    except ImportError:
+        from urllib3.util.retry import Retry  # NOQA
+
+    _HTTPError = requests.HTTPError
+
+    session = requests.Session()
+    session.mount(
+        'https://',
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=_POLL_WORKERS,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[429, 502, 503, 504]
+            )
+        )
+    )
+    session.headers.update({
+        'Connection': 'keep-alive',
+        'Accept-Encoding': 'gzip, deflate'
+    })
+    session.params = dict(apiKey=api_key)
+    return session
+
+
+def _get_session(api_key, session=None):
+    # a single keep-alive connection pool is shared by every request made
+    # with an api key, so a call does not pay for a new TLS handshake.
+    # session is one a Client made for a key that has now been seen to
+    # work, it is kept unless another one got there first
+    with _sessions_lock:
+        if api_key not in _sessions:
+            _sessions[api_key] = session or _new_session(api_key)
+
+        return _sessions[api_key]
+
+
+def _to_str(value):
+    # the API hands back text, names given to us as bytes get decoded so
+    # they compare equal to it
+    if isinstance(value, bytes):
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            return value.decode('latin-1')
+    return value
+
+
+def _fold_name(name):
+    # the same room name can come back from the server in a different
+    # unicode form or case than it is typed in, fold both the same way
+    name = unicodedata.normalize('NFC', _to_str(name))
+    try:
+        return name.casefold()
+    except AttributeError:
+        return name.lower()
 
 
 def c2f(c_temp):
@@ -57,64 +168,191 @@ def f2c(f_temp):
     return (float(f_temp) - 32.0) * 5.0 / 9.0
 
 
-class Singleton(type):
-    _instances = {}
+def _dew_point(temp, humidity):
+    # temp is in celsius
+    if temp > 0:
+        var1 = 17.368
+        var2 = 238.88
+    else:
+        var1 = 17.966
+        var2 = 247.15
 
-    def __call__(cls, *args):
-        if cls not in cls._instances:
-            cls._instances[cls] = {}
+    pa = humidity / 100. * math.exp(var1 * temp / (var2 + temp))
+    return var2 * math.log(pa) / (var1 - math.log(pa))
 
-        keys = list(args[:])
-        for i, arg in enumerate(keys[:]):
-            if isinstance(arg, dict):
-                keys[i] = str(arg)
 
-        keys = tuple(keys)
+def _heat_index(temp, humidity):
+    # temp is in fahrenheit
+    heat_index = (
+        0.5 * (temp + 61.0 + (temp - 68.0) * 1.2 + humidity * 0.094)
+    )
 
-        instances = cls._instances[cls]
+    if heat_index >= 80:
+        temp2 = temp * temp
+        humidity2 = humidity * humidity
+        heat_index = (
+            -42.379 +
+            2.04901523 * temp +
+            10.14333127 * humidity -
+            0.22475541 * temp * humidity -
+            6.83783e-3 * temp2 -
+            5.481717e-2 * humidity2 +
+            1.22874e-3 * temp2 * humidity +
+            8.5282e-4 * temp * humidity2 -
+            1.99e-6 * temp2 * humidity2
+        )
 
-        for key, value in instances.items():
-            if key == keys:
-                return value
+    return heat_index
 
-        instances[keys] = super(
-            Singleton,
-            cls
-        ).__call__(*args)
 
-        return instances[keys]
+class Singleton(type):
+    _instances = {}
+
+    def __call__(cls, *args):
+        keys = tuple(
+            str(arg) if isinstance(arg, dict) else arg for arg in args
+        )
+        instances = cls._instances.setdefault(cls, {})
+
+        instance = instances.get(keys)
+        if instance is None:
+            instance = instances[keys] = super(
+                Singleton,
+                cls
+            ).__call__(*args)
+
+        return instance
+
+
+_MODE_PROPERTY_NAMES = frozenset((
+    'swing',
+    'temp',
+    'fan_level',
+    'temp_unit',
+    '*'
+))
+
+_POD_PROPERTY_NAMES = frozenset((
+    'mode',
+    'power',
+    'room_temp',
+    'room_humidity',
+    'battery_voltage',
+    '*'
+))
+
+_PROPERTY_NAMES = _POD_PROPERTY_NAMES | _MODE_PROPERTY_NAMES
+
+# acState key, event name attribute, is a Mode event, value conversion
+_STATE_FIELDS = (
+    ('swing', '_evt_swing', True, None),
+    ('targetTemperature', '_evt_temp', True, None),
+    ('fanLevel', '_evt_fan', True, None),
+    ('on', '_evt_power', False, bool),
+    ('temperatureUnit', '_evt_unit', True, None),
+)
+
+# measurement key, event name attribute, affects dew point and heat index
+_MEASUREMENT_FIELDS = (
+    ('temperature', '_evt_temp_room', True),
+    ('humidity', '_evt_rh', True),
+    ('batteryVoltage', '_evt_bat', False),
+)
 
 
 class Notify(object):
+    __slots__ = (
+        '__literal',
+        '__wildcard',
+        '__catch_all',
+        '__batch',
+        '__bound'
+    )
 
     def __init__(self):
-        self.__callbacks = {}
+        # exact event names are looked up directly, only the wildcard
+        # bindings need to be matched against each event that is fired.
+        # wildcards are compiled once when bound: {pattern: (match, {})}.
+        # a pattern made up of only '*' gets every event and is kept in a
+        # bucket of its own that needs no matching at all
+        self.__literal = {}
+        self.__wildcard = {}
+        self.__catch_all = {}
+        # callbacks that get every change of a polling cycle in one call,
+        # keyed by the lowered device name or '*' for all devices
+        self.__batch = {}
+        # guid: (callbacks, owning index, event) so unbind goes straight
+        # to the bucket a callback lives in
+        self.__bound = {}
 
     def bind(self, event, callback):
         guid = new_guid()
-        if event not in self.__callbacks:
-            self.__callbacks[event] = {}
+        event = event.lower()
+
+        if not event.strip('*'):
+            owner = None
+            callbacks = self.__catch_all
+        elif '*' in event or '?' in event:
+            owner = self.__wildcard
+            if event not in owner:
+                owner[event] = (re.compile(fnmatch.translate(event)).match, {})
+            callbacks = owner[event][1]
+        else:
+            owner = self.__literal
+            if event not in owner:
+                owner[event] = {}
+            callbacks = owner[event]
 
-        self.__callbacks[event][guid] = callback
+        callbacks[guid] = callback
+        self.__bound[guid] = (callbacks, owner, event)
+
+        return guid
+
+    def bind_batch(self, name, callback):
+        guid = new_guid()
+        name = name.lower()
+
+        if name not in self.__batch:
+            self.__batch[name] = {}
+
+        callbacks = self.__batch[name]
+        callbacks[guid] = callback
+        self.__bound[guid] = (callbacks, self.__batch, name)
 
         return guid
 
     def unbind(self, guid):
-        for callbacks in self.__callbacks.values():
-            if guid in callbacks:
-                del (callbacks[guid])
+        if guid not in self.__bound:
+            return
+
+        callbacks, owner, event = self.__bound.pop(guid)
+        del (callbacks[guid])
+
+        if owner is not None and not callbacks:
+            del (owner[event])
 
     def __call__(self, event, value, obj):
+        evt = event.lower()
 
-        def process_callbacks(e):
-            for callback in self.__callbacks[e].values():
+        if evt in self.__literal:
+            for callback in self.__literal[evt].values():
                 callback(event, value, obj)
 
-        for evt in self.__callbacks.keys():
-            if ('*' in evt or '?' in evt) and fnmatch.fnmatch(event, evt):
-                process_callbacks(evt)
-            elif evt.lower() == event:
-                process_callbacks(evt)
+        for match, callbacks in self.__wildcard.values():
+            if match(evt):
+                for callback in callbacks.values():
+                    callback(event, value, obj)
+
+        for callback in self.__catch_all.values():
+            callback(event, value, obj)
+
+    def notify_batch(self, name, changes, obj):
+        # changes is {event: value} for everything that changed on the
+        # device named name during a single polling cycle
+        for key in (name.lower(), '*'):
+            if key in self.__batch:
+                for callback in self.__batch[key].values():
+                    callback(name + '.changes', changes, obj)
 
 
 Notify = Notify()
@@ -128,6 +366,11 @@ class Mode(object):
         self.name = name
         self._supported = supported
 
+        self._evt_swing = '{0}.{1}.swing'.format(pod.name, name)
+        self._evt_temp = '{0}.{1}.temp'.format(pod.name, name)
+        self._evt_fan = '{0}.{1}.fan_level'.format(pod.name, name)
+        self._evt_unit = '{0}.{1}.temp_unit'.format(pod.name, name)
+
     @property
     def supported_swing_modes(self):
         """
@@ -271,16 +514,15 @@ class Mode(object):
 
     @temp_unit.setter
     def temp_unit(self, value):
+        if 'temperatures' not in self._supported:
+            raise AttributeError
 
-        values = (
-            value.lower(),
-            value.title(),
-            value.title()[0],
-            value.lower()[0]
-        )
+        supported = self._supported['temperatures']
+        lower = value.lower()
+        title = value.title()
 
-        for v in values:
-            if v in self.supported_temp_units:
+        for v in (lower, title, title[:1], lower[:1]):
+            if v in supported:
                 self._pod.set_state(temperatureUnit=v)
                 break
         else:
@@ -374,15 +616,7 @@ class Mode(object):
             self._pod.mode = self
 
     def bind(self, property_name, callback):
-        property_names = (
-            'swing',
-            'temp',
-            'fan_level',
-            'temp_unit',
-            '*'
-        )
-
-        if property_name not in property_names:
+        if property_name not in _MODE_PROPERTY_NAMES:
             raise ValueError
 
         return Notify.bind(
@@ -402,49 +636,69 @@ class Pod(object):
         self.__fnht = None
         self.__clcs = None
 
-        self._api_key = api_key
+        self._session = _get_session(api_key)
 
         if PY2:
             self.name = name.encode('utf-8')
         else:
             self.name = str(name)
 
+        self._evt_mode = '{0}.mode'.format(self.name)
+        self._evt_power = '{0}.power'.format(self.name)
+        self._evt_rh = '{0}.room_humidity'.format(self.name)
+        self._evt_temp_room = '{0}.room_temp'.format(self.name)
+        self._evt_dp = '{0}.room_dew_point'.format(self.name)
+        self._evt_hi = '{0}.room_heat_index'.format(self.name)
+        self._evt_bat = '{0}.battery_voltage'.format(self.name)
+
         self.uid = uid
         self._model = None
         self._capabilities = None
+        self._supported_modes = None
+        self._mode_by_name = None
+        self._state_cache = None
+        self._state_ts = 0.0
+        self._meas_cache = None
+        self._meas_ts = 0.0
+        self._firmware_cache = None
+        self._firmware_ts = 0.0
+        self._cache_ttl = 0.5
+
+        self._modes_caps = self.capabilities['modes']
 
         mode = self.state['mode']
-        self._mode = Mode(self, mode, self.capabilities['modes'][mode])
-        self._event = threading.Event()
-        self._thread = None
+        self._mode = Mode(self, mode, self._modes_caps[mode])
 
-    def start_poll(self, poll_interval):
+    def start_poll(self, poll_interval, max_poll_interval=None):
         """
         Start polling.
 
-        Starts a polling cycle for a Sensibo device. When a polling cycle is
-        started for each device a new thread is created so the cycles can run
+        Starts a polling cycle for a Sensibo device. The polling cycles of
+        all devices are run by a single shared scheduler thread, the
+        requests for devices that are due at the same time are made in
         parallel to each other.
 
+        The Sensibo API does not push changes so they have to be polled for.
+        If a `max_poll_interval` is given the interval is stretched each
+        time nothing has changed on the device, up to `max_poll_interval`,
+        and goes back to `poll_interval` as soon as something changes.
+        While the device can not be reached the interval is stretched the
+        same way, up to a minute or `max_poll_interval` if that is longer.
+
         :param poll_interval: how often to check, decimal notation of seconds.
         Example:
             * ``0.5`` - half a second
             * ``1.0`` - one second
             * ``2.25`` - two and a quarter seconds
         :type poll_interval: float
+        :param max_poll_interval: longest interval to back off to while the
+        device is idle, ``None`` to always use `poll_interval`.
+        :type max_poll_interval: float
 
         :return: None
         :rtype: None
         """
-        while self._event.isSet():
-            pass
-
-        if self._thread is None:
-            self._thread = threading.Thread(
-                target=self._poll,
-                args=(poll_interval,)
-            )
-            self._thread.start()
+        _Scheduler.register(self, poll_interval, max_poll_interval)
 
     def stop_poll(self):
         """
@@ -455,9 +709,7 @@ class Pod(object):
         :return: None
         :rtype: None
         """
-        if self._thread is not None:
-            self._event.set()
-            self._thread.join(3)
+        _Scheduler.unregister(self)
 
     @property
     def is_polling(self):
@@ -466,199 +718,62 @@ class Pod(object):
         :return: True/False
         :rtype: bool
         """
-        return self._thread is not None and not self._event.isSet()
-
-    def _poll(self, poll_interval):
-        old_state = dict(
-            mode=None,
-            swing=None,
-            targetTemperature=None,
-            fanLevel=None,
-            on=None,
-            temperatureUnit=None
-        )
-
-        for key, value in self.state.items():
-            old_state[key] = value
-
-        measurements = self._measurements
-
-        old_measurements = dict(
-            temperature=None,
-            humidity=None,
-            batteryVoltage=None
-        )
-
-        if 'temperature' in measurements:
-            old_measurements['temperature'] = measurements['temperature']
-
-        if 'humidity' in measurements:
-            old_measurements['humidity'] = measurements['humidity']
-
-        if 'batteryVoltage' in measurements:
-            old_measurements['batteryVoltage'] = measurements['batteryVoltage']
-
-        while not self._event.isSet():
-            state = self.state
-            measurements = self._measurements
-
-            if 'mode' in state:
-                mode = state['mode']
-            else:
-                mode = None
-
-            if 'swing' in state:
-                swing = state['swing']
-            else:
-                swing = None
-
-            if 'targetTemperature' in state:
-                temp = state['targetTemperature']
-            else:
-                temp = None
-
-            if 'fanLevel' in state:
-                fan = state['fanLevel']
-            else:
-                fan = None
-
-            if 'on' in state:
-                power = state['on']
-            else:
-                power = None
-
-            if 'temperatureUnit' in state:
-                temp_unit = state['temperatureUnit']
-            else:
-                temp_unit = None
-
-            if 'temperature' in measurements:
-                temperature = measurements['temperature']
-            else:
-                temperature = None
-            if 'humidity' in measurements:
-                humidity = measurements['humidity']
-            else:
-                humidity = None
-
-            if 'batteryVoltage' in measurements:
-                battery_voltage = measurements['batteryVoltage']
-            else:
-                battery_voltage = None
-
-            if mode is not None and mode != old_state['mode']:
-                self._mode = Mode(self, mode, self.capabilities['modes'][mode])
-                old_state['mode'] = mode
-                Notify('{0}.mode'.format(self.name), self._mode.name, self)
-
-            if swing is not None and swing != old_state['swing']:
-                old_state['swing'] = swing
-                Notify(
-                    '{0}.{1}.swing'.format(self.name, self._mode.name),
-                    swing,
-                    self._mode
-                )
-
-            if temp is not None and temp != old_state['targetTemperature']:
-                old_state['targetTemperature'] = temp
-
-                Notify(
-                    '{0}.{1}.temp'.format(self.name, self._mode.name),
-                    temp,
-                    self._mode
-                )
-
-            if fan is not None and fan != old_state['fanLevel']:
-                old_state['fanLevel'] = fan
-                Notify(
-                    '{0}.{1}.fan_level'.format(self.name, self._mode.name),
-                    fan,
-                    self._mode
-                )
-
-            if power is not None and power != old_state['on']:
-                old_state['on'] = power
-
-                Notify(
-                    '{0}.power'.format(self.name),
-                    bool(power),
-                    self
-                )
-
-            if (
-                temp_unit is not None and
-                temp_unit != old_state['temperatureUnit']
-            ):
-                old_state['temperatureUnit'] = temp_unit
-
-                Notify(
-                    '{0}.{1}.temp_unit'.format(self.name, self._mode.name),
-                    temp_unit,
-                    self._mode
-                )
-
-            def hi_dp_event():
-                try:
-                    Notify(
-                        '{0}.room_dew_point'.format(self.name),
-                        self.room_dew_point,
-                        self
-                    )
-                    Notify(
-                        '{0}.room_heat_index'.format(self.name),
-                        self.room_heat_index,
-                        self
-                    )
-                except AttributeError:
-                    pass
+        return _Scheduler.is_registered(self)
 
-            def rh_event():
-                Notify(
-                    '{0}.room_humidity'.format(self.name),
-                    humidity,
-                    self
-                )
-
-            def temp_event():
-                Notify(
-                    '{0}.room_temp'.format(self.name),
-                    temperature,
-                    self
-                )
-
-            if (
-                humidity != old_measurements['humidity'] and
-                temperature != old_measurements['temperature']
-            ):
-                old_measurements['temperature'] = temperature
-                old_measurements['humidity'] = humidity
-                temp_event()
-                rh_event()
-                hi_dp_event()
-
-            elif temperature != old_measurements['temperature']:
-                old_measurements['temperature'] = temperature
-                temp_event()
-                hi_dp_event()
-
-            elif humidity != old_measurements['humidity']:
-                old_measurements['humidity'] = humidity
-                rh_event()
-                hi_dp_event()
-
-            if battery_voltage != old_measurements['batteryVoltage']:
-                old_measurements['batteryVoltage'] = battery_voltage
-
-                Notify(
-                    '{0}.battery_voltage'.format(self.name),
-                    battery_voltage,
-                    self
-                )
-
-            self._event.wait(poll_interval)
-
-        self._thread = None
-        self._event.clear()
+    def _notify_climate(self, measurements, changes):
+        # computed from the measurements this poll already has in hand
+        try:
+            dew_point = self._room_dew_point(measurements)
+            heat_index = self._room_heat_index(measurements)
+        except AttributeError:
+            return
+
+        changes[self._evt_dp] = dew_point
+        Notify(self._evt_dp, dew_point, self)
+        changes[self._evt_hi] = heat_index
+        Notify(self._evt_hi, heat_index, self)
+
+    def _poll(self, old, state, measurements):
+        # fires the events for anything that differs from the last values
+        # seen and then a single batch with all of them, returns True if
+        # there was a change
+        changes = {}
+
+        mode = state.get('mode')
+        if mode is not None and mode != old.get('mode'):
+            old['mode'] = mode
+            self._mode = Mode(self, mode, self._modes_caps[mode])
+            changes[self._evt_mode] = self._mode.name
+            Notify(self._evt_mode, self._mode.name, self)
+
+        for key, event, on_mode, convert in _STATE_FIELDS:
+            value = state.get(key)
+            if value is not None and value != old.get(key):
+                old[key] = value
+                target = self._mode if on_mode else self
+                if convert is not None:
+                    value = convert(value)
+                evt = getattr(target, event)
+                changes[evt] = value
+                Notify(evt, value, target)
+
+        climate_changed = False
+        for key, event, climate in _MEASUREMENT_FIELDS:
+            value = measurements.get(key)
+            if value != old.get(key):
+                old[key] = value
+                climate_changed = climate_changed or climate
+                evt = getattr(self, event)
+                changes[evt] = value
+                Notify(evt, value, self)
+
+        if climate_changed:
+            self._notify_climate(measurements, changes)
+
+        if changes:
+            Notify.notify_batch(self.name, changes, self)
+
+        return bool(changes)
 
     @property
     def supported_modes(self):
@@ -669,8 +784,16 @@ class Pod(object):
 
         *Return type:* `list`
         """
-        for mode in sorted(self.capabilities['modes'].keys()):
-            yield Mode(self, mode, self.capabilities['modes'][mode])
+        if self._supported_modes is None:
+            modes = self._modes_caps
+            self._supported_modes = [
+                Mode(self, mode, modes[mode]) for mode in sorted(modes.keys())
+            ]
+            self._mode_by_name = dict(
+                (mode.name, mode) for mode in self._supported_modes
+            )
+        # a copy so changes made by the caller do not reach the cache
+        return list(self._supported_modes)
 
     @property
     def capabilities(self):
@@ -703,22 +826,22 @@ class Pod(object):
         return self._model
 
     def _get(self, path=None, **params):
-        params['apiKey'] = self._api_key
-
         if path is None:
-            response = requests.get(
+            response = self._session.get(
                 '{0}/pods/{1}'.format(_SERVER, self.uid),
-                params=params
+                params=params,
+                timeout=_TIMEOUT
             )
         else:
-            response = requests.get(
+            response = self._session.get(
                 '{0}/pods/{1}/{2}'.format(_SERVER, self.uid, path),
-                params=params
+                params=params,
+                timeout=_TIMEOUT
             )
 
         response.raise_for_status()
 
-        response = json.loads(response.content.decode())['result']
+        response = _json.loads(response.content)['result']
 
         try:
             return response[0]
@@ -726,43 +849,61 @@ class Pod(object):
             return response
 
     def _patch(self, property_name, data, **params):
-        params['apiKey'] = self._api_key
-        response = requests.patch(
+        response = self._session.patch(
             "{0}/pods/{1}/acStates/{2}".format(
                 _SERVER,
                 self.uid,
                 property_name
             ),
             params=params,
-            data=data
+            data=data,
+            timeout=_TIMEOUT
         )
         response.raise_for_status()
 
-        return json.loads(response.content.decode())
+        return _json.loads(response.content)
 
     def _post(self, path, data, **params):
-        params['apiKey'] = self._api_key
-        response = requests.post(
+        response = self._session.post(
             '{0}/pods/{1}/{2}'.format(_SERVER, self.uid, path),
             params=params,
-            data=data
+            data=data,
+            timeout=_TIMEOUT
         )
         response.raise_for_status()
-        return json.loads(response.content.decode())
+        return _json.loads(response.content)
 
     @property
     def _measurements(self):
+        now = _monotonic()
+
+        if (
+            self._meas_cache is not None and
+            now - self._meas_ts < self._cache_ttl
+        ):
+            return self._meas_cache
+
+        return self._fetch_measurements()
+
+    def _fetch_measurements(self):
+        # always goes to the server, the polling cycle uses this directly
+        # so it is not handed cached values when polling faster than the
+        # cache lives
+        now = _monotonic()
+
         try:
             result = self._get(
                 "measurements",
                 fields="batteryVoltage,temperature,humidity,time"
             )
-        except requests.HTTPError:
+        except _HTTPError:
             result = self._get(
                 "measurements",
                 fields="temperature,humidity,time"
             )
 
+        self._meas_cache = result
+        self._meas_ts = now
         return result
 
     @property
@@ -807,6 +948,13 @@ class Pod(object):
         except KeyError:
             raise AttributeError
 
+    @staticmethod
+    def _climate(measurements):
+        try:
+            return measurements['temperature'], measurements['humidity']
+        except KeyError:
+            raise AttributeError
+
     @property
     def room_dew_point(self):
         """
@@ -816,8 +964,10 @@ class Pod(object):
 
         *Return type:* `float`
         """
-        temp = self.room_temp
-        humidity = self.room_humidity
+        return self._room_dew_point(self._measurements)
+
+    def _room_dew_point(self, measurements):
+        temp, humidity = self._climate(measurements)
 
         try:
             self.__fnht = fnht = self.mode.temp_unit.lower().startswith('f')
@@ -830,17 +980,7 @@ class Pod(object):
         if fnht:
             temp = f2c(temp)
 
-        if temp > 0:
-            var1 = 17.368
-            var2 = 238.88
-        else:
-            var1 = 17.966
-            var2 = 247.15
-
-        import math
-
-        pa = humidity / 100. * math.exp(var1 * temp / (var2 + temp))
-        dew_point = var2 * math.log(pa) / (var1 - math.log(pa))
+        dew_point = _dew_point(temp, humidity)
 
         if fnht:
             dew_point = c2f(dew_point)
@@ -856,8 +996,10 @@ class Pod(object):
 
         *Return type:* `float`
         """
-        temp = self.room_temp
-        humidity = self.room_humidity
+        return self._room_heat_index(self._measurements)
+
+    def _room_heat_index(self, measurements):
+        temp, humidity = self._climate(measurements)
 
         try:
             self.__clcs = clcs = self.mode.temp_unit.lower().startswith('c')
@@ -870,24 +1012,7 @@ class Pod(object):
         if clcs:
             temp = c2f(temp)
 
-        heat_index = (
-            0.5 * (temp + 61.0 + (temp - 68.0) * 1.2 + humidity * 0.094)
-        )
-
-        if heat_index >= 80:
-            import math
-
-            heat_index = math.fsum([
-                -42.379,
-                2.04901523 * temp,
-                10.14333127 * humidity,
-                -0.22475541 * temp * humidity,
-                -6.83783e-3 * temp ** 2,
-                -5.481717e-2 * humidity ** 2,
-                1.22874e-3 * temp ** 2 * humidity,
-                8.5282e-4 * temp * humidity ** 2,
-                -1.99e-6 * temp ** 2 * humidity ** 2,
-            ])
+        heat_index = _heat_index(temp, humidity)
 
         if clcs:
             heat_index = f2c(heat_index)
@@ -896,23 +1021,46 @@ class Pod(object):
 
     @property
     def state(self):
+        if (
+            self._state_cache is None or
+            _monotonic() - self._state_ts >= self._cache_ttl
+        ):
+            return self._fetch_state()
+
+        return self._state_cache
+
+    def _fetch_state(self):
+        # uncached counterpart of state, see _fetch_measurements
+        now = _monotonic()
+
         result = self._get(
             "acStates",
             limit=1,
             fields="status,reason,acState"
         )
-
-        return result['acState']
+        self._state_cache = result['acState']
+        self._state_ts = now
+        return self._state_cache
 
     def set_state(self, **kwargs):
+        # a call without exactly one setting fails before any request
+        ((property_name, value),) = kwargs.items()
+
+        current_state = self.state
+
         data = dict(
-            currentAcState=self.state,
-            newValue=list(kwargs.values())[0]
+            currentAcState=current_state,
+            newValue=value
         )
         self._patch(
-            list(kwargs.keys())[0],
-            json.dumps(data)
+            property_name,
+            # orjson hands back bytes, which requests sends as-is
+            _json.dumps(data)
         )
+        # a new dict, one handed out by state earlier is left as it was
+        new_state = dict(current_state)
+        new_state[property_name] = value
+        self._state_cache = new_state
 
     @property
     def power(self):
@@ -975,18 +1123,18 @@ class Pod(object):
             else:
                 raise ValueError
 
-        elif 'mode' in self.capabilities['modes']:
-            for found_mode in self.supported_modes:
-                if found_mode.name == value:
-                    if not self.is_polling:
-                        self._mode = found_mode
+        else:
+            if self._mode_by_name is None:
+                self.supported_modes  # NOQA  fills in self._mode_by_name
 
-                    self.set_state(mode=value)
-                    break
-            else:
+            found_mode = self._mode_by_name.get(value)
+            if found_mode is None:
                 raise ValueError
-        else:
-            raise AttributeError
+
+            if not self.is_polling:
+                self._mode = found_mode
+
+            self.set_state(mode=value)
 
     @property
     def firmware_version(self):
@@ -997,11 +1145,47 @@ class Pod(object):
 
         *Return type:* `str`
         """
+        if (
+            self._firmware_cache is not None and
+            _monotonic() - self._firmware_ts < self._cache_ttl
+        ):
+            return self._firmware_cache
+
         result = self._get('acStates', fields='device', limit=1)
         if 'firmwareVersion' in result['device']:
             return result['device']['firmwareVersion']
         raise AttributeError
 
+    def refresh(self):
+        """
+        Refresh.
+
+        Gets the state, measurements, model and firmware version of the
+        device in a single request. Reading those properties right after
+        a refresh is served from the values it fetched.
+
+        :return: None
+        :rtype: None
+        """
+        result = self._get(
+            fields='acState,measurements,productModel,firmwareVersion'
+        )
+        now = _monotonic()
+
+        self._state_cache = result['acState']
+        self._state_ts = now
+
+        if result.get('measurements'):
+            self._meas_cache = result['measurements']
+            self._meas_ts = now
+
+        if 'productModel' in result:
+            self._model = result['productModel']
+
+        if 'firmwareVersion' in result:
+            self._firmware_cache = result['firmwareVersion']
+            self._firmware_ts = now
+
     def bind(self, property_name, callback):
         """
         Bind event.
@@ -1019,6 +1203,8 @@ class Pod(object):
             * ``'room_humidity'`` - Humidity of the room.
             * ``'battery_voltage'`` - Battery voltage (if supported)
             * ``'*'`` - All of the above
+            * ``'changes'`` - Everything that changed in a polling cycle,
+            passed as a single ``dict`` of ``{event: value}``
 
         :type property_name: str
         :param callback: Callable object.
@@ -1032,43 +1218,275 @@ class Pod(object):
         :return: A unique identifier that is used when unbind from the event.
         :rtype: str
         """
-        property_names = (
-            'mode',
-            'power',
-            'room_temp',
-            'room_humidity',
-            'battery_voltage',
-            '*'
-        )
-
-        if property_name in property_names[:6]:
+        if property_name == 'changes':
+            return Notify.bind_batch(self.name, callback)
+        elif property_name in _POD_PROPERTY_NAMES:
             return Notify.bind(
                 '{0}.{1}'.format(self.name, property_name),
                 callback
             )
-        elif property_name in property_names[6:]:
-            return Notify.bind(
-                '{0}.*.{1}'.format(self.name, property_name),
-                callback
-            )
         else:
             raise ValueError
 
     def __getattr__(self, item):
-        if item in self.__dict__:
-            return self.__dict__[item]
+        # only called once the instance and the class have been searched,
+        # a private name that gets here has not been set yet
+        if item.startswith('_'):
+            raise AttributeError
+
+        if self._mode_by_name is None:
+            self.supported_modes  # NOQA  fills in self._mode_by_name
 
-        for mode in self.supported_modes:
-            if mode.name == item:
-                return mode
+        if item in self._mode_by_name:
+            return self._mode_by_name[item]
 
         raise AttributeError
 
 
+class _Job(object):
+    # a call made on one of the scheduler's worker threads, done is called
+    # on that thread once it has finished
+
+    def __init__(self, func, done):
+        self._func = func
+        self._on_done = done
+        self._result = None
+        self._error = None
+
+    def run(self):
+        try:
+            self._result = self._func()
+        except Exception as err:
+            self._error = err
+
+        self._on_done()
+
+    def result(self):
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class _Scheduler(object):
+    """
+    Runs the polling cycles of every :class:`Pod` from one thread.
+
+    Each time a device is due its state and its measurements are requested
+    in parallel on the scheduler's worker threads. The worker that finishes
+    last diffs the changes and fires the events for that device, so a slow
+    or unreachable device does not hold up the polling of the others.
+    A device is not asked again until its last poll has finished.
+
+    Like the scheduler thread the workers are not daemon threads, a running
+    polling cycle keeps the program alive until :meth:`Pod.stop_poll` is
+    called. They all end once no device is being polled.
+    """
+
+    def __init__(self):
+        self._lock = threading.Condition()
+        # pod: [next run, current interval, last seen values,
+        #       poll interval, max poll interval, poll in flight]
+        self._pods = {}
+        # devices with a poll that has not finished yet, the worker pool is
+        # sized from this so a device that hangs can not starve the others
+        self._in_flight = 0
+        self._thread = None
+
+    def register(self, pod, poll_interval, max_poll_interval=None):
+        with self._lock:
+            if pod in self._pods:
+                return
+
+            if max_poll_interval is None:
+                max_poll_interval = poll_interval
+
+            self._pods[pod] = [
+                _monotonic(),
+                poll_interval,
+                None,
+                poll_interval,
+                max(poll_interval, max_poll_interval),
+                False
+            ]
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.start()
+            else:
+                self._lock.notify()
+
+    def unregister(self, pod):
+        with self._lock:
+            if pod in self._pods:
+                del self._pods[pod]
+                self._lock.notify()
+
+    def is_registered(self, pod):
+        return pod in self._pods
+
+    def _due(self):
+        # blocks until at least one device is due, returns None once there
+        # are no devices left to poll
+        with self._lock:
+            while self._pods:
+                now = _monotonic()
+                next_runs = [
+                    entry[0] for entry in self._pods.values() if not entry[5]
+                ]
+
+                if not next_runs:
+                    # every device is still waiting on its last poll
+                    self._lock.wait()
+                    continue
+
+                next_run = min(next_runs)
+
+                if next_run > now:
+                    self._lock.wait(next_run - now)
+                    continue
+
+                due = []
+                for pod, entry in self._pods.items():
+                    if not entry[5] and entry[0] <= now:
+                        entry[0] = now + entry[1]
+                        entry[5] = True
+                        self._in_flight += 1
+                        due += [(pod, entry)]
+                return due
+
+            self._thread = None
+            return None
+
+    @staticmethod
+    def _work(jobs):
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+
+            job.run()
+
+    def _run(self):
+        # the workers belong to this run of the scheduler, a new run after
+        # the last device stopped polling starts its own
+        jobs = queue.Queue()
+        workers = []
+
+        try:
+            self._cycle(jobs, workers)
+        finally:
+            for _ in workers:
+                jobs.put(None)
+
+    def _cycle(self, jobs, workers):
+        while True:
+            due = self._due()
+            if due is None:
+                break
+
+            # two requests per device, workers are only added as more
+            # devices are polled at the same time. the polls still running
+            # from earlier are counted too, they are holding workers
+            while len(workers) < min(_POLL_WORKERS, self._in_flight * 2):
+                worker = threading.Thread(target=self._work, args=(jobs,))
+                worker.start()
+                workers += [worker]
+
+            for pod, entry in due:
+                self._submit(jobs, pod, entry)
+
+    def _submit(self, jobs, pod, entry):
+        # the state and the measurements are separate endpoints, both are
+        # asked for at once and whichever comes back last handles the
+        # results. the caches are bypassed, a poll always wants fresh values
+        remaining = [2]
+        remaining_lock = threading.Lock()
+
+        def done():
+            with remaining_lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+
+            self._complete(pod, entry, state, measurements)
+
+        state = _Job(pod._fetch_state, done)
+        measurements = _Job(pod._fetch_measurements, done)
+        jobs.put(state)
+        jobs.put(measurements)
+
+    def _complete(self, pod, entry, state, measurements):
+        # runs on a worker thread, the device's next poll is not started
+        # until this has cleared its in flight flag
+        interval = None
+        failed = False
+
+        try:
+            state = state.result()
+            measurements = measurements.result()
+        except Exception as err:
+            # backed off so one that can not be reached is not asked at the
+            # shortest interval the whole time. it has a cap of its own, a
+            # device polled without a max poll interval would not back off
+            _LOGGER.warning('Unable to poll %s: %s', pod.name, err)
+            interval = min(
+                entry[1] * _POLL_BACKOFF,
+                max(entry[4], _POLL_RETRY_MAX)
+            )
+            failed = True
+        else:
+            try:
+                if entry[2] is None:
+                    entry[2] = dict(state)
+                    entry[2].update(measurements)
+                elif self.is_registered(pod):
+                    if pod._poll(entry[2], state, measurements):
+                        interval = entry[3]
+                    else:
+                        interval = min(entry[1] * _POLL_BACKOFF, entry[4])
+            except Exception:
+                _LOGGER.exception('Error handling the poll of %s', pod.name)
+
+        with self._lock:
+            if failed:
+                # a failed request can take a while to give up, the wait
+                # starts from now so the next one does not go out at once
+                entry[0] = _monotonic() + interval
+            elif interval is not None:
+                entry[0] += interval - entry[1]
+
+            if interval is not None:
+                entry[1] = interval
+
+            entry[5] = False
+            self._in_flight -= 1
+            self._lock.notify()
+
+
+_Scheduler = _Scheduler()
+
+
 class Client(object):
 
     def __init__(self, api_key):
         self._api_key = api_key
+        # a key is only shared once a request made with it has worked,
+        # until then the Client has a session of its own so a mistyped
+        # key does not leave one behind
+        with _sessions_lock:
+            self._session = _sessions.get(api_key)
+
+        self._session_shared = self._session is not None
+        if not self._session_shared:
+            self._session = _new_session(api_key)
+
+        self._devices_cache = None
+        self._devices_cached_at = 0.0
+        self._devices_ttl = 60.0
+        self._uid_to_name = {}
+        # folded name: [names], rooms can differ only by case
+        self._folded_names = {}
+        self._pods = {}
 
     def bind(self, property_name, callback):
         """
@@ -1091,6 +1509,8 @@ class Client(object):
             * ``'fan_level'`` - Fan speed.
             * ``'temp_unit'`` - Unit of measure (C/F).
             * ``'*'`` - All of the above
+            * ``'changes'`` - Everything that changed on a device in a
+            polling cycle, passed as a single ``dict`` of ``{event: value}``
 
         :type property_name: str
         :param callback: Callable object.
@@ -1105,20 +1525,10 @@ class Client(object):
         :rtype: str
         """
 
-        property_names = (
-            'mode',
-            'power',
-            'room_temp',
-            'room_humidity',
-            'battery_voltage',
-            'swing',
-            'temp',
-            'fan_level',
-            'temp_unit',
-            '*'
-        )
+        if property_name == 'changes':
+            return Notify.bind_batch('*', callback)
 
-        if property_name not in property_names:
+        if property_name not in _PROPERTY_NAMES:
             raise ValueError
 
         return Notify.bind('*' + property_name, callback)
@@ -1150,104 +1560,212 @@ class Client(object):
         :return: `dict` of the names: uid.
         :rtype: dict
         """
-        params = dict(
-            apiKey=self._api_key,
-            fields="id,room"
-        )
+        now = _monotonic()
 
-        response = requests.get(
+        if (
+            self._devices_cache is not None and
+            now - self._devices_cached_at < self._devices_ttl
+        ):
+            return self._devices_cache
+
+        response = self._session.get(
             _SERVER + '/users/me/pods',
-            params=params
+            params=dict(fields="id,room"),
+            timeout=_TIMEOUT,
+            stream=ijson is not None
         )
 
-        response.raise_for_status()
-        result = json.loads(response.content.decode())
-        devices = []
+        try:
+            response.raise_for_status()
+
+            if ijson is None:
+                pods = _json.loads(response.content)['result']
+            else:
+                # parse the pods as they come off the socket instead of
+                # holding the whole body in memory first
+                response.raw.decode_content = True
+                pods = ijson.items(response.raw, 'result.item')
+
+            self._devices_cache = dict(
+                (device['room']['name'], device['id']) for device in pods
+            )
+        finally:
+            response.close()
+
+        if not self._session_shared:
+            session = _get_session(self._api_key, self._session)
+            if session is not self._session:
+                self._session.close()
+                self._session = session
+            self._session_shared = True
+
+        self._uid_to_name = dict(
+            (uid, name) for name, uid in self._devices_cache.items()
+        )
+        self._folded_names = {}
+        for name in self._devices_cache:
+            self._folded_names.setdefault(_fold_name(name), []).append(name)
+        self._devices_cached_at = now
+
+        return self._devices_cache
+
+    def invalidate_devices(self):
+        """
+        Discards the cached unit names.
 
-        for device in result['result']:
-            devices += [(device['room']['name'], device['id'])]
+        The next access to :attr:`~Client.devices` gets a fresh list from
+        the server.
 
-        return dict(devices)
+        :return: None
+        :rtype: None
+        """
+        self._devices_cache = None
 
     def get_device(self, name):
         """
         Get device.
 
-        Creates a :class:`Pod` instance that represents a device.
+        Creates a :class:`Pod` instance that represents a device. The same
+        instance is handed back each time a device is asked for.
 
-        :param name: Unit (room) name.
+        :param name: Unit (room) name or the UID of the unit. If there is
+        no room by that exact name the case is ignored, as long as only one
+        room matches.
         :type name: str
-        :return: A :class:`Pod` instance
+        :return: A :class:`Pod` instance, ``None`` if no single device
+        matches.
         :rtype: Pod
         """
+        name = _to_str(name)
         devices = self.devices
 
-        try:
-            name = name.decode('utf-8')
-        except UnicodeDecodeError:
-            try:
-                name = (
-                    name.decode('latin-1').decode('utf-8')
-                )
-            except UnicodeEncodeError:
-                pass
+        if name in devices:
+            uid = devices[name]
+        elif name in self._uid_to_name:
+            uid = name
+            name = self._uid_to_name[uid]
+        else:
+            names = self._folded_names.get(_fold_name(name), [])
+            if len(names) != 1:
+                return None
 
-        except AttributeError:
-            pass
+            name = names[0]
+            uid = devices[name]
 
-        for pod_name in devices.keys():
-            try:
-                pd_name = pod_name.decode('utf-8')
-            except UnicodeEncodeError:
-                try:
-                    pd_name = pod_name.decode('latin-1').decode('utf-8')
-                except UnicodeEncodeError:
-                    pd_name = pod_name
-            except AttributeError:
-                pd_name = pod_name
+        if uid not in self._pods:
+            self._pods[uid] = Pod(self._api_key, name, uid)
 
-            if pd_name == name:
-                return Pod(
-                    self._api_key,
-                    pd_name,
-                    devices[pod_name]
-                )
+        return self._pods[uid]
 
 
 if __name__ == "__main__":
+    import requests  # NOQA
+    import codecs  # NOQA
+
+    try:
+        _prompt = raw_input
+    except NameError:
+        _prompt = input
+
+    try:
+        import selectors
+    except ImportError:
+        selectors = None
+
+    # poll events are queued up and printed by the main thread while it
+    # waits on stdin, so they are not held back by a blocking prompt
+    events = queue.Queue()
+
+    if selectors is None or sys.platform.startswith('win'):
+        # select() only works on sockets on Windows
+        selector = None
+    else:
+        selector = selectors.DefaultSelector()
+        try:
+            selector.register(sys.stdin, selectors.EVENT_READ)
+        except (OSError, ValueError):
+            # regular files (scripted input) can not be waited on, they
+            # are always ready to read anyway
+            selector = None
+
+    def _print_events():
+        while not events.empty():
+            print(*events.get())
+
+    def _print_lines(items):
+        # a single write instead of one per line. room names are unicode
+        # on Python 2, str() would fail on anything that is not ascii
+        sys.stdout.write(u''.join(u'%s\n' % _to_str(item) for item in items))
+
+    def _print_devices():
+        _print_lines(
+            ['-' * 10 + ' devices ' + '-' * 10] +
+            client.device_names +
+            ['-' * 29]
+        )
+
+    # stdin is read straight from the file descriptor, anything buffered
+    # by sys.stdin would not wake up the selector. the decoder holds on to
+    # a character that is split between two reads
+    stdin_buffer = ['']
+    stdin_decoder = codecs.getincrementaldecoder('utf-8')('replace')
+
+    def _read_command(prompt):
+        if selector is None:
+            _print_events()
+            return _prompt(prompt)
+
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+
+        while '\n' not in stdin_buffer[0]:
+            if not events.empty():
+                print()
+                _print_events()
+                sys.stdout.write(prompt)
+                sys.stdout.flush()
+
+            if selector.select(timeout=0.1):
+                data = os.read(sys.stdin.fileno(), 1024)
+                if not data:
+                    raise EOFError
+                stdin_buffer[0] += stdin_decoder.decode(data)
+
+        line, stdin_buffer[0] = stdin_buffer[0].split('\n', 1)
+        return line
 
     def get_client():
-        try:
-            a_key = raw_input('Enter API Key: ').strip()
-        except NameError:
-            a_key = input('Enter API Key: ').strip()
+        while True:
+            a_key = _read_command('Enter API Key: ').strip()
 
-        try:
-            return Client(a_key)
-        except:
-            print('Invalid API key or unable to connect to server.')
-            return get_client()
+            try:
+                c = Client(a_key)
+                # the key is only checked once a request is made
+                c.device_names
+                return c
+            except (requests.RequestException, ValueError):
+                print('Invalid API key or unable to connect to server.')
 
     client = get_client()
 
     def connect_device():
-        print("-" * 10, "devices", "-" * 10)
-        for d in client.device_names:
-            print(d)
-        print('-' * 29)
+        while True:
+            _print_devices()
 
-        try:
-            dev_name = raw_input('Enter device name to connect to: ').strip()
-        except NameError:
-            dev_name = input('Enter device name to connect to: ').strip()
+            dev_name = _read_command(
+                'Enter device name to connect to: '
+            ).strip()
+
+            try:
+                d = client.get_device(dev_name)
+            except (requests.RequestException, ValueError):
+                d = None
+
+            if d is not None:
+                print('Successfully connected to ' + d.name)
+                return d
 
-        try:
-            d = client.get_device(dev_name)
-            print('Successfully connected to ' + dev_name)
-            return d
-        except:
             print('Invalid device.')
-            return connect_device()
 
     dev = connect_device()
 
@@ -1295,233 +1813,269 @@ if __name__ == "__main__":
     power POWER
     scale SCALE
 
-    start poll POLLING SPEED - poll the device for changes.
-                               POLLING SPEED is in seconds
+    start poll POLLING SPEED [MAX SPEED] - poll the device for changes.
+                               POLLING SPEED is in seconds and has to
+                               be more than 0. Without a speed polling
+                               is stopped
+                               MAX SPEED is optional, polling slows down
+                               to it while nothing changes
                                example:
                                    "start poll 2.0" - every 2 seconds
                                    "start poll 0.5" - every 1/2 a second
+                                   "start poll 1.0 30.0" - every second,
+                                   backing off to every 30 seconds
 
     '''
+    # (label, attribute name) pairs printed by the info command
+    DEVICE_ATTRS = tuple(
+        (label, label.lower().replace(' ', '_')) for label in (
+            'Model',
+            'Name',
+            'UID',
+            'Firmware Version',
+            'Battery Voltage',
+            'Power',
+            'Room Temp',
+            'Room Humidity',
+            'Room Dew Point',
+            'Room Heat Index'
+        )
+    )
+
+    MODE_ATTRS = tuple(
+        (label, label.lower().replace(' ', '_')) for label in (
+            'Supported Swing Modes',
+            'Supported Temp Units',
+            'Supported Temps',
+            'Supported Fan Levels'
+        )
+    )
+
     print('"help" for a list of commands')
     poll_guid = None
 
 
-    def _callback(ev, vl, _):
-        print(ev, '=', vl)
+    def _callback(_, changes, __):
+        for ev, vl in changes.items():
+            events.put((ev, '=', vl))
+
+
+    def _power(value):
+        if value:
+            if value == 'on':
+                dev.power = True
+            elif value == 'off':
+                dev.power = False
+            else:
+                raise ValueError
+        else:
+            print('on' if dev.power else 'off')
+
+
+    def _operating_mode(value):
+        if value:
+            dev.mode = value
+        else:
+            print(dev.mode.name)
+
+
+    def _scale(value):
+        if value:
+            dev.mode.temp_unit = value
+        else:
+            print(dev.mode.temp_unit)
+
+
+    def _temperature_setpoint(value):
+        if value:
+            dev.mode.temp = int(value)
+        else:
+            print(dev.mode.temp)
+
+
+    def _swing_mode(value):
+        if value:
+            dev.mode.swing = value
+        else:
+            print(dev.mode.swing)
+
+
+    def _fan_level(value):
+        if value:
+            dev.mode.fan_level = value
+        else:
+            print(dev.mode.fan_level)
+
+
+    def _start_poll(value):
+        global poll_guid
+
+        # checked before anything is stopped, a bad command leaves a
+        # running poll alone. an interval of 0 would poll nonstop
+        intervals = [float(v) for v in value.split()]
+        if len(intervals) > 2 or any(v <= 0 for v in intervals):
+            raise ValueError
+
+        if poll_guid is not None:
+            client.unbind(poll_guid)
+            dev.stop_poll()
+            poll_guid = None
+
+        if intervals:
+            dev.start_poll(*intervals)
+            poll_guid = dev.bind('changes', _callback)
+            print('Polling started.')
+
+        else:
+            print('Polling stopped.')
+
+
+    # commands that take an optional value, keyed by the command verb
+    SETTERS = {
+        'power': _power,
+        'operating mode': _operating_mode,
+        'scale': _scale,
+        'temperature setpoint': _temperature_setpoint,
+        'swing mode': _swing_mode,
+        'fan level': _fan_level,
+        'start poll': _start_poll
+    }
+
+    # longest first so a command is never matched by a shorter verb that
+    # happens to be its prefix
+    SETTER_VERBS = tuple(sorted(SETTERS, key=len, reverse=True))
+
+    GETTERS = {
+        'temperature': lambda: print(dev.room_temp),
+        'humidity': lambda: print(dev.room_humidity),
+        'battery voltage': lambda: print(dev.battery_voltage),
+        'firmware version': lambda: print(dev.firmware_version),
+        'model number': lambda: print(dev.model),
+        'uid': lambda: print(dev.uid),
+        'heat index': lambda: print(dev.room_heat_index),
+        'dew point': lambda: print(dev.room_dew_point),
+        'supported operating modes': lambda: _print_lines(
+            m.name for m in dev.supported_modes
+        ),
+        'supported temperature setpoints': lambda: _print_lines(
+            dev.mode.supported_temps
+        ),
+        'supported scales': lambda: _print_lines(
+            dev.mode.supported_temp_units
+        ),
+        'supported swing modes': lambda: _print_lines(
+            dev.mode.supported_swing_modes
+        ),
+        'supported fan levels': lambda: _print_lines(
+            dev.mode.supported_fan_levels
+        )
+    }
 
 
     while True:
         try:
-            try:
-                command = raw_input('Enter Command: ').strip()
-            except NameError:
-                command = input('Enter Command: ').strip()
+            command = _read_command('Enter Command: ').strip()
 
             if command == 'help':
                 print(HELP)
                 continue
 
             if command == 'list devices':
-                print("-" * 10, "devices", "-" * 10)
-                for d in client.device_names:
-                    print(d)
-                print('-' * 29)
+                _print_devices()
                 continue
 
-            if dev is None and 'connect' not in command:
+            is_connect = command.startswith('connect ')
+
+            if dev is None and not is_connect:
                 print('You need to connect to a device first')
                 print()
                 print(HELP)
                 continue
 
-            if 'connect' in command:
-                device_name = command.replace('connect ', '')
-                dev = client.get_device(device_name)
-                print('Successfully connected to ' + device_name)
+            if is_connect:
+                device_name = command[len('connect '):].strip()
+                d = client.get_device(device_name)
+
+                if d is None:
+                    print('Invalid device.')
+                else:
+                    dev = d
+                    print('Successfully connected to ' + d.name)
                 continue
 
             elif command == 'info':
-                device_attrs = (
-                    'Model',
-                    'Name',
-                    'UID',
-                    'Firmware Version',
-                    'Battery Voltage',
-                    'Power',
-                    'Room Temp',
-                    'Room Humidity',
-                    'Room Dew Point',
-                    'Room Heat Index'
-                )
-
-                for d_attr in device_attrs:
-                    attr = getattr(dev, d_attr.lower().replace(' ', '_'), None)
+                dev.refresh()
+
+                out = []
+
+                def line(*args):
+                    out.append(u' '.join(u'%s' % _to_str(arg) for arg in args))
+
+                for d_attr, attr_name in DEVICE_ATTRS:
+                    attr = getattr(dev, attr_name, None)
                     if isinstance(attr, list):
-                        print('Device', d_attr + ':')
+                        line('Device', d_attr + ':')
                         for list_item in attr:
-                            print('   ', list_item)
+                            line('   ', list_item)
                     else:
-                        print('Device', d_attr + ':', attr)
+                        line('Device', d_attr + ':', attr)
 
-                print('Set Mode:', dev.mode.name)
+                mode = dev.mode
+
+                line('Set Mode:', mode.name)
 
                 try:
-                    print('Set Temp:', dev.mode.temp, dev.mode.temp_unit)
+                    line('Set Temp:', mode.temp, mode.temp_unit)
                 except AttributeError:
                     pass
 
                 try:
-                    print('Set Fan Level:', dev.mode.fan_level)
+                    line('Set Fan Level:', mode.fan_level)
                 except AttributeError:
                     pass
 
                 try:
-                    print('Set Swing Mode:', dev.mode.swing)
+                    line('Set Swing Mode:', mode.swing)
                 except AttributeError:
                     pass
 
-                print('Supported Modes:')
+                line('Supported Modes:')
+
+                def iter_attr(a, label, indent):
+                    if isinstance(a, list):
+                        line(indent, label + ':')
+                        for itm in a:
+                            line(indent, '  ', itm)
+                    elif isinstance(a, dict):
+                        line(indent, label + ':')
+                        for k, v in a.items():
+                            iter_attr(v, k, indent + '    ')
+                    else:
+                        line(indent, label + ':', a)
 
                 for m in dev.supported_modes:
-                    print('   ', m.name)
-                    mode_attrs = (
-                        'Supported Swing Modes',
-                        'Supported Temp Units',
-                        'Supported Temps',
-                        'Supported Fan Levels'
-                    )
-
-                    for m_attr in mode_attrs:
-                        attr = getattr(
-                            m,
-                            m_attr.lower().replace(' ', '_'),
-                            None
-                        )
-
-
-                        def iter_attr(a, label, indent):
-                            if isinstance(attr, list):
-                                print(indent, label + ':')
-                                for itm in a:
-                                    print(indent, '  ', itm)
-                            elif isinstance(a, dict):
-                                print(indent, label + ':')
-                                for k, v in a.items():
-                                    iter_attr(v, k, indent + '    ')
-                            else:
-                                print(indent, label + ':', a)
-
+                    line('   ', m.name)
 
+                    for m_attr, attr_name in MODE_ATTRS:
+                        attr = getattr(m, attr_name, None)
                         iter_attr(attr, m_attr, '       ')
+
+                _print_lines(out)
                 continue
 
             try:
-
-                if command.startswith('power'):
-                    command = command.replace('power', '').strip()
-                    if command:
-                        if command == 'on':
-                            command = True
-
-                        elif command == 'off':
-                            command = False
-                        else:
-                            raise ValueError
-
-                        dev.power = command
-
-                    else:
-                        print('on' if dev.power else 'off')
-                elif command.startswith('operating mode'):
-                    command = command.replace('operating mode', '').strip()
-                    if command:
-                        dev.mode = command
-
-                    else:
-                        print(dev.mode.name)
-                elif command.startswith('scale'):
-                    command = command.replace('scale', '').strip()
-                    if command:
-                        dev.mode.temp_unit = command
-
-                    else:
-                        print(dev.mode.temp_unit)
-                elif command.startswith('temperature setpoint'):
-                    command = command.replace(
-                        'temperature setpoint',
-                        ''
-                    ).strip()
-
-                    if command:
-                        dev.mode.temp = int(command)
-
-                    else:
-                        print(dev.mode.temp)
-                elif command.startswith('swing mode'):
-                    command = command.replace('swing mode', '').strip()
-                    if command:
-                        dev.mode.swing = command
-
-                    else:
-                        print(dev.mode.swing)
-                elif command.startswith('fan level'):
-                    command = command.replace('fan level', '').strip()
-                    if command:
-                        dev.mode.fan_level = command
-
-                    else:
-                        print(dev.mode.fan_level)
-
-                elif command.startswith('start poll'):
-                    command = command.replace('start poll ', '').strip()
-
-                    if poll_guid is not None:
-                        client.unbind(poll_guid)
-                        dev.stop_poll()
-                        poll_guid = None
-
-                    if command and command != '0.0':
-                        dev.start_poll(float(command))
-                        poll_guid = dev.bind('*', _callback)
-                        print('Polling started.')
-
-                    else:
-                        print('Polling stopped.')
-
-                    continue
-                elif command == 'temperature':
-                    print(dev.room_temp)
-                elif command == 'humidity':
-                    print(dev.room_humidity)
-                elif command == 'battery voltage':
-                    print(dev.battery_voltage)
-                elif command == 'firmware version':
-                    print(dev.firmware_version)
-                elif command == 'model number':
-                    print(dev.model)
-                elif command == 'uid':
-                    print(dev.uid)
-                elif command == 'heat index':
-                    print(dev.room_heat_index)
-                elif command == 'dew point':
-                    print(dev.room_dew_point)
-                elif command == 'supported operating modes':
-                    for m in dev.supported_modes:
-                        print(m.name)
-                elif command == 'supported temperature setpoints':
-                    for t in dev.mode.supported_temps:
-                        print(t)
-                elif command == 'supported scales':
-                    for u in dev.mode.supported_temp_units:
-                        print(u)
-                elif command == 'supported swing modes':
-                    for s in dev.mode.supported_swing_modes:
-                        print(s)
-                elif command == 'supported fan levels':
-                    for f in dev.mode.supported_fan_levels:
-                        print(f)
+                if command in GETTERS:
+                    GETTERS[command]()
                 else:
-                    raise AttributeError
+                    for verb in SETTER_VERBS:
+                        if (
+                            command.startswith(verb) and
+                            command[len(verb):len(verb) + 1] in ('', ' ')
+                        ):
+                            SETTERS[verb](command[len(verb):].strip())
+                            break
+                    else:
+                        raise AttributeError
             except AttributeError:
                 print('Command not valid for this device/mode')
                 continue
@@ -1530,9 +2084,6 @@ if __name__ == "__main__":
                 continue
 
             except Exception:
-                import traceback
-
-
                 traceback.print_exc()
                 continue
 
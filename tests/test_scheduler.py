@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import threading
+import time
+import unittest
+
+import pySensibo_Sky
+
+
+class FakePod(object):
+
+    def __init__(self, name, delay, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.polls = 0
+
+    def _fetch_state(self):
+        time.sleep(self.delay)
+        if self.fail:
+            raise IOError('unreachable')
+        return {'on': True}
+
+    def _fetch_measurements(self):
+        time.sleep(self.delay)
+        return {}
+
+    def _poll(self, old, state, measurements):
+        self.polls += 1
+        return True
+
+
+class SchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = type(pySensibo_Sky._Scheduler)()
+        self.pods = []
+
+    def tearDown(self):
+        for pod in self.pods:
+            self.scheduler.unregister(pod)
+
+    def register(self, pod, poll_interval):
+        self.pods += [pod]
+        self.scheduler.register(pod, poll_interval)
+
+    def test_slow_device_does_not_starve_others(self):
+        # devices are started one at a time, the one that hangs holds the
+        # workers it was given and the next one needs workers of its own
+        slow = FakePod('slow', 3.0)
+        fast = FakePod('fast', 0.0)
+
+        self.register(slow, 0.2)
+        time.sleep(0.05)
+        self.register(fast, 0.2)
+        time.sleep(1.5)
+
+        self.assertGreater(fast.polls, 2)
+        self.assertEqual(slow.polls, 0)
+
+        workers = [
+            thread for thread in threading.enumerate()
+            if getattr(thread, '_target', None) == self.scheduler._work
+        ]
+        self.assertGreaterEqual(len(workers), 4)
+
+    def test_unreachable_device_backs_off(self):
+        # polled without a max poll interval, a failure still backs off
+        down = FakePod('down', 0.0, fail=True)
+        logger = logging.getLogger('pySensibo_Sky')
+        logger.disabled = True
+
+        try:
+            self.register(down, 0.1)
+            time.sleep(1.0)
+        finally:
+            logger.disabled = False
+
+        self.assertGreater(self.scheduler._pods[down][1], 0.3)
+
+
+if __name__ == '__main__':
+    unittest.main()